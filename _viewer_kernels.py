@@ -0,0 +1,42 @@
+"""
+Compiled numeric kernels for the Brownstone IFC viewer.
+
+Kept in an importable module of their own so Numba's on-disk cache files
+sit next to a stable module path and warm runs skip compilation
+entirely. Explicit signatures mean the kernels are compiled at import
+time rather than on first call.
+
+Numba is optional; without it the kernels run as plain Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+@njit('int32[:](int32[:], int64)', cache=True)
+def _build_faces(faces_flat, n_faces):
+    """Build the PyVista face buffer [3, i0, i1, i2, ...] for triangles"""
+    out = np.empty(n_faces * 4, dtype=np.int32)
+    for i in range(n_faces):
+        out[4 * i] = 3
+        out[4 * i + 1] = faces_flat[3 * i]
+        out[4 * i + 2] = faces_flat[3 * i + 1]
+        out[4 * i + 3] = faces_flat[3 * i + 2]
+    return out
+
+@njit('void(int32[:], int64[:], int64[:])', cache=True)
+def _offset_faces(faces_flat, vert_counts, face_counts):
+    """Shift each entity's face indices by its cumulative vertex offset, in place"""
+    pos = 0
+    offset = 0
+    for e in range(vert_counts.shape[0]):
+        for i in range(pos, pos + face_counts[e]):
+            faces_flat[i] += offset
+        pos += face_counts[e]
+        offset += vert_counts[e]
@@ -21,7 +21,6 @@ import time
 import os
 import sys
 import math
-import uuid
 import tempfile
 import numpy as np
 from datetime import datetime
@@ -42,13 +41,115 @@ ROOF_THICKNESS = 1.5  # feet
 FOOT_TO_METER = 0.3048
 INCH_TO_METER = 0.0254
 
+# Frequently used dimensions precomputed in meters, so the hot loops don't
+# re-run convert_to_meter on compile-time constants
+BUILDING_WIDTH_M = BUILDING_WIDTH * FOOT_TO_METER
+BUILDING_DEPTH_M = BUILDING_DEPTH * FOOT_TO_METER
+WALL_THICKNESS_M = WALL_THICKNESS * FOOT_TO_METER
+FLOOR_THICKNESS_M = FLOOR_THICKNESS * FOOT_TO_METER
+ROOF_THICKNESS_M = ROOF_THICKNESS * FOOT_TO_METER
+
 def convert_to_meter(feet):
     """Convert feet to meters"""
     return feet * FOOT_TO_METER
 
+# Canonical axis tuples, built once instead of as a fresh literal at every
+# geometry call site
+_O = (0.0, 0.0, 0.0)
+_Z = (0.0, 0.0, 1.0)
+_X = (1.0, 0.0, 0.0)
+
+# Caches for canonical geometry entities. The same handful of points and
+# directions (origin, +Z, +X, ...) are referenced by almost every element,
+# so they are created once per model and reused instead of allocating a
+# fresh STEP entity on each call.
+_point_cache = {}
+_dir_cache = {}
+
+def _coord_key(model, coords):
+    """Build a cache key for a coordinate tuple, rounded to absorb float noise"""
+    return (id(model), tuple(round(c, 9) for c in coords))
+
+def get_point(model, coords):
+    """Get a cached IfcCartesianPoint for the given coordinates"""
+    key = _coord_key(model, coords)
+    point = _point_cache.get(key)
+    if point is None:
+        point = _point_cache[key] = model.createIfcCartesianPoint([float(c) for c in coords])
+    return point
+
+def get_dir(model, coords):
+    """Get a cached IfcDirection for the given coordinates"""
+    key = _coord_key(model, coords)
+    direction = _dir_cache.get(key)
+    if direction is None:
+        direction = _dir_cache[key] = model.createIfcDirection([float(c) for c in coords])
+    return direction
+
+# Every extrusion is positioned with the same identity axes (origin, +Z, +X),
+# so a single IfcAxis2Placement3D can be shared by all of them.
+_identity_placement_cache = {}
+
+def get_identity_placement(model):
+    """Get the shared identity IfcAxis2Placement3D for extrusion positions"""
+    placement = _identity_placement_cache.get(id(model))
+    if placement is None:
+        placement = _identity_placement_cache[id(model)] = model.createIfcAxis2Placement3D(
+            get_point(model, _O),
+            get_dir(model, _Z),
+            get_dir(model, _X)
+        )
+    return placement
+
+# Local placements repeat heavily (identity rotations at a handful of
+# origins), so they are cached the same way as points and directions
+_local_placement_cache = {}
+
+def get_local_placement(model, origin, zdir=_Z, xdir=_X, parent=None):
+    """Get a cached IfcLocalPlacement for the given origin and axes"""
+    key = (id(model), id(parent) if parent is not None else None,
+           tuple(round(c, 9) for c in origin),
+           tuple(round(c, 9) for c in zdir),
+           tuple(round(c, 9) for c in xdir))
+    placement = _local_placement_cache.get(key)
+    if placement is None:
+        placement = _local_placement_cache[key] = model.createIfcLocalPlacement(
+            parent,
+            model.createIfcAxis2Placement3D(
+                get_point(model, origin),
+                get_dir(model, zdir),
+                get_dir(model, xdir)
+            )
+        )
+    return placement
+
+# Profiles and extruded shapes are pure geometry, so elements sharing the
+# same dimensions can legally reference the same entities. Profiles are
+# cached by (kind, dims) and the full product definition shape by
+# (kind, dims, height).
+_profile_cache = {}
+_shape_cache = {}
+
+def _dim_key(model, kind, *dims):
+    """Build a cache key for a set of dimensions, rounded to absorb float noise"""
+    return (id(model), kind) + tuple(round(d, 9) for d in dims)
+
+# GUIDs are generated in batches: one os.urandom call per batch instead of
+# one OS entropy read (plus a uuid.UUID object) per entity
+_GUID_BATCH_SIZE = 1024
+_guid_pool = []
+
+def _refill_guid_pool(n=_GUID_BATCH_SIZE):
+    """Refill the GUID pool from a single bulk entropy read"""
+    buf = os.urandom(16 * n)
+    _guid_pool.extend(ifcopenshell.guid.compress(buf[i*16:(i+1)*16].hex())
+                      for i in range(n))
+
 def create_guid():
     """Generate a GUID for IFC entities"""
-    return ifcopenshell.guid.compress(uuid.uuid4().hex)
+    if not _guid_pool:
+        _refill_guid_pool()
+    return _guid_pool.pop()
 
 def create_ifc_model():
     """Create a new IFC model with basic setup"""
@@ -74,11 +175,11 @@ def create_ifc_model():
     owner_history = model.createIfcOwnerHistory(person_and_org, application, "READWRITE", None, None, None, None, timestring)
     
     # Create project context
-    project_context = model.createIfcGeometricRepresentationContext(None, "Model", 3, 1.0E-5, 
+    project_context = model.createIfcGeometricRepresentationContext(None, "Model", 3, 1.0E-5,
                                                                    model.createIfcAxis2Placement3D(
-                                                                       model.createIfcCartesianPoint([0.0, 0.0, 0.0]),
-                                                                       model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                                       model.createIfcDirection([1.0, 0.0, 0.0])
+                                                                       get_point(model, _O),
+                                                                       get_dir(model, _Z),
+                                                                       get_dir(model, _X)
                                                                    ), None)
     
     # Define units
@@ -117,24 +218,16 @@ def create_storeys(model, building, owner_history):
     """Create building storeys"""
     storeys = []
     storey_names = ["Basement", "First Floor", "Second Floor", "Third Floor", "Fourth Floor", "Roof"]
-    storey_elevations = [
-        -convert_to_meter(BASEMENT_HEIGHT),
-        0.0,
-        convert_to_meter(FIRST_FLOOR_HEIGHT),
-        convert_to_meter(FIRST_FLOOR_HEIGHT + SECOND_FLOOR_HEIGHT),
-        convert_to_meter(FIRST_FLOOR_HEIGHT + SECOND_FLOOR_HEIGHT + THIRD_FLOOR_HEIGHT),
-        convert_to_meter(FIRST_FLOOR_HEIGHT + SECOND_FLOOR_HEIGHT + THIRD_FLOOR_HEIGHT + FOURTH_FLOOR_HEIGHT)
-    ]
+    # Elevations are the running sum of the floor heights below each storey,
+    # computed in one vectorized pass and converted to meters in a single
+    # scalar multiply
+    floor_heights = np.array([FIRST_FLOOR_HEIGHT, SECOND_FLOOR_HEIGHT, THIRD_FLOOR_HEIGHT, FOURTH_FLOOR_HEIGHT])
+    storey_elevations = (np.concatenate(([-BASEMENT_HEIGHT, 0.0], np.cumsum(floor_heights))) * FOOT_TO_METER).tolist()
     
     for i, (name, elevation) in enumerate(zip(storey_names, storey_elevations)):
         storey = model.createIfcBuildingStorey(create_guid(), owner_history, name, 
                                               f"{name} of the brownstone", None,
-                                              model.createIfcLocalPlacement(None, 
-                                                                          model.createIfcAxis2Placement3D(
-                                                                              model.createIfcCartesianPoint([0.0, 0.0, elevation]),
-                                                                              model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                                              model.createIfcDirection([1.0, 0.0, 0.0])
-                                                                          )),
+                                              get_local_placement(model, (0.0, 0.0, elevation)),
                                               None, None, "ELEMENT", elevation)
         storeys.append(storey)
     
@@ -143,31 +236,93 @@ def create_storeys(model, building, owner_history):
     
     return storeys
 
-def create_walls(model, storeys, owner_history, context):
+def create_material_layer_set_usage(model, material_name, thickness):
+    """Create the material/layer/layer set/usage chain for a material"""
+    material = model.createIfcMaterial(material_name)
+    material_layer = model.createIfcMaterialLayer(material, thickness, None)
+    material_layer_set = model.createIfcMaterialLayerSet([material_layer], None)
+    return model.createIfcMaterialLayerSetUsage(material_layer_set, "AXIS2", "POSITIVE", 0.0)
+
+# Wall layout as a data-oriented spec table: a numeric pass fills an
+# array-of-structs describing every wall, and a thin writer turns the
+# specs into IFC entities. When Numba is available the numeric pass is
+# JIT-compiled; otherwise it runs as plain Python over NumPy arrays.
+try:
+    from numba import njit
+except ImportError:
+    def njit(func):
+        return func
+
+WALL_SPEC_DTYPE = np.dtype([
+    ('ox', 'f8'), ('oy', 'f8'), ('oz', 'f8'),  # start point
+    ('ex', 'f8'), ('ey', 'f8'),                # end point (same z as start)
+    ('height', 'f8'), ('storey', 'i4'), ('kind', 'i4')
+])
+
+WALL_KIND_NAMES = ("Front Wall", "Back Wall", "Left Wall", "Right Wall",
+                   "Corridor Wall", "Cross Wall 1", "Cross Wall 2")
+
+@njit
+def build_wall_specs(elevations, heights, width, depth):
+    """Fill the wall spec table for every storey (numeric work only)"""
+    # Endpoint table per wall kind: ox, oy, ex, ey
+    ends = np.empty((7, 4))
+    ends[0, 0] = 0.0;       ends[0, 1] = 0.0;       ends[0, 2] = width; ends[0, 3] = 0.0        # front
+    ends[1, 0] = 0.0;       ends[1, 1] = depth;     ends[1, 2] = width; ends[1, 3] = depth      # back
+    ends[2, 0] = 0.0;       ends[2, 1] = 0.0;       ends[2, 2] = 0.0;   ends[2, 3] = depth      # left
+    ends[3, 0] = width;     ends[3, 1] = 0.0;       ends[3, 2] = width; ends[3, 3] = depth      # right
+    ends[4, 0] = 0.0;       ends[4, 1] = depth/2;   ends[4, 2] = width; ends[4, 3] = depth/2    # corridor
+    ends[5, 0] = width/3;   ends[5, 1] = 0.0;       ends[5, 2] = width/3;   ends[5, 3] = depth  # cross 1
+    ends[6, 0] = width/3*2; ends[6, 1] = 0.0;       ends[6, 2] = width/3*2; ends[6, 3] = depth  # cross 2
+
+    # Perimeter walls everywhere; interior walls on all storeys but the basement
+    n_walls = 0
+    for i in range(len(heights)):
+        n_walls += 4 if i == 0 else 7
+
+    specs = np.empty(n_walls, dtype=WALL_SPEC_DTYPE)
+    w = 0
+    for i in range(len(heights)):
+        n_kinds = 4 if i == 0 else 7
+        for k in range(n_kinds):
+            specs[w]['ox'] = ends[k, 0]
+            specs[w]['oy'] = ends[k, 1]
+            specs[w]['oz'] = elevations[i]
+            specs[w]['ex'] = ends[k, 2]
+            specs[w]['ey'] = ends[k, 3]
+            specs[w]['height'] = heights[i]
+            specs[w]['storey'] = i
+            specs[w]['kind'] = k
+            w += 1
+
+    return specs
+
+def create_walls(model, storeys, owner_history, context, contained):
     """Create the walls for each storey"""
     all_walls = []
-    
+
     # Wall heights for each storey
-    wall_heights = [
+    wall_heights = np.array([
         BASEMENT_HEIGHT,
         FIRST_FLOOR_HEIGHT,
         SECOND_FLOOR_HEIGHT,
         THIRD_FLOOR_HEIGHT,
         FOURTH_FLOOR_HEIGHT
-    ]
-    
-    for i, storey in enumerate(storeys[:-1]):  # Skip roof "storey"
-        # Get the storey elevation
-        storey_elevation = storey.Elevation
-        wall_height = convert_to_meter(wall_heights[i])
-        
-        # Calculate width and depth in meters
-        width = convert_to_meter(BUILDING_WIDTH)
-        depth = convert_to_meter(BUILDING_DEPTH)
-        thickness = convert_to_meter(WALL_THICKNESS)
-        
-        walls = []
-        
+    ]) * FOOT_TO_METER
+
+    elevations = np.array([storey.Elevation for storey in storeys[:-1]])  # Skip roof "storey"
+
+    # Fill the numeric spec table in one pass, then write entities from it
+    specs = build_wall_specs(elevations, wall_heights, BUILDING_WIDTH_M, BUILDING_DEPTH_M)
+
+    # Material layer sets are shared between storeys that use the same
+    # material, with one IfcRelAssociatesMaterial per material at the end
+    material_sets = {}
+    walls_by_material = {}
+
+    for spec in specs:
+        i = int(spec['storey'])
+
         # Wall material based on floor
         if i == 0:  # Basement
             material_name = "Concrete"
@@ -175,172 +330,129 @@ def create_walls(model, storeys, owner_history, context):
             material_name = "Brownstone"
         else:  # Upper floors
             material_name = "Brick"
-        
-        # Create a material
-        material = model.createIfcMaterial(material_name)
-        material_layer = model.createIfcMaterialLayer(material, convert_to_meter(WALL_THICKNESS), None)
-        material_layer_set = model.createIfcMaterialLayerSet([material_layer], None)
-        material_layer_set_usage = model.createIfcMaterialLayerSetUsage(material_layer_set, "AXIS2", "POSITIVE", 0.0)
-        
-        # Create front wall (with potential openings)
-        front_wall = create_wall(model, owner_history, context, 
-                                "Front Wall", 
-                                [0, 0, storey_elevation], 
-                                [width, 0, storey_elevation], 
-                                thickness, wall_height, material_layer_set_usage)
-        walls.append(front_wall)
-        
-        # Create back wall
-        back_wall = create_wall(model, owner_history, context, 
-                               "Back Wall", 
-                               [0, depth, storey_elevation], 
-                               [width, depth, storey_elevation], 
-                               thickness, wall_height, material_layer_set_usage)
-        walls.append(back_wall)
-        
-        # Create left wall
-        left_wall = create_wall(model, owner_history, context, 
-                               "Left Wall", 
-                               [0, 0, storey_elevation], 
-                               [0, depth, storey_elevation], 
-                               thickness, wall_height, material_layer_set_usage)
-        walls.append(left_wall)
-        
-        # Create right wall
-        right_wall = create_wall(model, owner_history, context, 
-                                "Right Wall", 
-                                [width, 0, storey_elevation], 
-                                [width, depth, storey_elevation], 
-                                thickness, wall_height, material_layer_set_usage)
-        walls.append(right_wall)
-        
-        # Add interior walls for a simplified layout
-        if i > 0:  # Not in basement
-            # Central corridor wall
-            corridor_wall = create_wall(model, owner_history, context,
-                                       "Corridor Wall",
-                                       [0, depth/2, storey_elevation],
-                                       [width, depth/2, storey_elevation],
-                                       thickness, wall_height, material_layer_set_usage)
-            walls.append(corridor_wall)
-            
-            # Cross walls
-            for j in range(1, 3):
-                cross_wall = create_wall(model, owner_history, context,
-                                        f"Cross Wall {j}",
-                                        [width/3 * j, 0, storey_elevation],
-                                        [width/3 * j, depth, storey_elevation],
-                                        thickness, wall_height, material_layer_set_usage)
-                walls.append(cross_wall)
-        
-        # Relate walls to storey
-        model.createIfcRelContainedInSpatialStructure(create_guid(), owner_history, 
-                                                     f"Storey {i} Walls", None, walls, storey)
-        
-        all_walls.extend(walls)
-    
+
+        # Create (or reuse) the material layer set
+        if material_name not in material_sets:
+            material_sets[material_name] = create_material_layer_set_usage(model, material_name, WALL_THICKNESS_M)
+
+        wall = create_wall(model, owner_history, context,
+                          WALL_KIND_NAMES[int(spec['kind'])],
+                          (float(spec['ox']), float(spec['oy']), float(spec['oz'])),
+                          (float(spec['ex']), float(spec['ey']), float(spec['oz'])),
+                          WALL_THICKNESS_M, float(spec['height']))
+
+        # Relate wall to storey
+        contained.setdefault(storeys[i], []).append(wall)
+        walls_by_material.setdefault(material_name, []).append(wall)
+        all_walls.append(wall)
+
+    # Assign materials, one relationship per material
+    for material_name, material_walls in walls_by_material.items():
+        model.createIfcRelAssociatesMaterial(create_guid(), owner_history, None, None,
+                                            material_walls, material_sets[material_name])
+
     return all_walls
 
-def create_wall(model, owner_history, context, name, start_point, end_point, thickness, height, material_layer_set_usage):
+def create_wall(model, owner_history, context, name, start_point, end_point, thickness, height):
     """Create a wall with the given parameters"""
     # Calculate direction and length
-    direction = [end_point[0] - start_point[0], end_point[1] - start_point[1], 0]
-    length = math.sqrt(direction[0]**2 + direction[1]**2)
-    
-    if length == 0:
+    dx = end_point[0] - start_point[0]
+    dy = end_point[1] - start_point[1]
+
+    if dx == 0 and dy == 0:
         return None
-    
-    # Normalize direction
-    normalized_direction = [direction[0] / length, direction[1] / length, 0]
-    
+
+    if dx == 0 or dy == 0:
+        # Axis-aligned wall (the common case): skip the sqrt/division and
+        # keep the direction exactly on a unit axis so cached directions
+        # are shared across all walls
+        length = abs(dx + dy)
+        normalized_direction = (math.copysign(1.0, dx) if dx else 0.0,
+                                math.copysign(1.0, dy) if dy else 0.0,
+                                0.0)
+    else:
+        length = math.sqrt(dx**2 + dy**2)
+        normalized_direction = (dx / length, dy / length, 0.0)
+
     # Create perpendicular direction (for wall thickness)
-    perp_direction = [-normalized_direction[1], normalized_direction[0], 0]
+    perp_direction = (-normalized_direction[1], normalized_direction[0], 0.0)
     
     # Create placement
-    wall_placement = model.createIfcLocalPlacement(None,
-                                                 model.createIfcAxis2Placement3D(
-                                                     model.createIfcCartesianPoint(start_point),
-                                                     model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                     model.createIfcDirection(normalized_direction)
-                                                 ))
+    wall_placement = get_local_placement(model, start_point, xdir=normalized_direction)
     
     # Create wall shape representation
     extrusion = create_wall_extrusion(model, context, length, thickness, height)
     
     # Create wall
-    wall = model.createIfcWallStandardCase(create_guid(), owner_history, name, "Exterior Wall", 
+    wall = model.createIfcWallStandardCase(create_guid(), owner_history, name, "Exterior Wall",
                                           None, wall_placement, extrusion, None, None)
-    
-    # Assign material
-    model.createIfcRelAssociatesMaterial(create_guid(), owner_history, None, None, [wall], material_layer_set_usage)
-    
+
     return wall
 
 def create_wall_extrusion(model, context, length, thickness, height):
     """Create an extrusion for a wall"""
-    # Create profile
-    points = [
-        [0, -thickness/2],
-        [length, -thickness/2],
-        [length, thickness/2],
-        [0, thickness/2],
-        [0, -thickness/2]
-    ]
-    
-    polyline = model.createIfcPolyline([model.createIfcCartesianPoint(point) for point in points])
-    profile = model.createIfcArbitraryClosedProfileDef("AREA", None, polyline)
-    
+    # Reuse the shape if a wall with the same dimensions was already built
+    shape_key = _dim_key(model, "wall", length, thickness, height)
+    if shape_key in _shape_cache:
+        return _shape_cache[shape_key]
+
+    # Create (or reuse) the profile
+    profile_key = _dim_key(model, "wall", length, thickness)
+    profile = _profile_cache.get(profile_key)
+    if profile is None:
+        # Axis-aligned rectangle: a rectangle profile positioned at the
+        # centroid replaces the former 5-point polyline. The wall origin
+        # is at a corner, so the centroid sits at (length/2, 0).
+        position = model.createIfcAxis2Placement2D(get_point(model, (length/2, 0.0)), get_dir(model, (1.0, 0.0)))
+        profile = _profile_cache[profile_key] = model.createIfcRectangleProfileDef("AREA", None, position, length, thickness)
+
     # Create extrusion
-    extrusion_direction = model.createIfcDirection([0.0, 0.0, 1.0])
-    extrusion = model.createIfcExtrudedAreaSolid(profile, 
-                                              model.createIfcAxis2Placement3D(
-                                                  model.createIfcCartesianPoint([0.0, 0.0, 0.0]),
-                                                  model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                  model.createIfcDirection([1.0, 0.0, 0.0])
-                                              ),
+    extrusion_direction = get_dir(model, _Z)
+    extrusion = model.createIfcExtrudedAreaSolid(profile,
+                                              get_identity_placement(model),
                                               extrusion_direction,
                                               height)
-    
+
     # Create shape representation
     shape_representation = model.createIfcShapeRepresentation(context, "Body", "SweptSolid", [extrusion])
-    
+
     # Create product definition shape
     product_definition_shape = model.createIfcProductDefinitionShape(None, None, [shape_representation])
-    
+    _shape_cache[shape_key] = product_definition_shape
+
     return product_definition_shape
 
-def create_slabs(model, storeys, owner_history, context):
+def create_slabs(model, storeys, owner_history, context, contained):
     """Create floor slabs for each level"""
     all_slabs = []
-    
+
+    # Shared material layer sets and batched material associations
+    material_sets = {}
+    slabs_by_material = {}
+
+    # Read all elevations up front rather than per iteration
+    elevations = [storey.Elevation for storey in storeys]
+
     for i, storey in enumerate(storeys[:-1]):  # Skip the roof "storey"
-        # Get the storey elevation
-        storey_elevation = storey.Elevation
-        next_elevation = storeys[i+1].Elevation
-        
+        # Get the next storey elevation
+        next_elevation = elevations[i+1]
+
         # Calculate width and depth in meters
-        width = convert_to_meter(BUILDING_WIDTH)
-        depth = convert_to_meter(BUILDING_DEPTH)
+        width = BUILDING_WIDTH_M
+        depth = BUILDING_DEPTH_M
         
         # Material based on floor
         material_name = "Concrete" if i == 0 else "Wood Floor"
         
-        # Create material
-        material = model.createIfcMaterial(material_name)
-        material_layer = model.createIfcMaterialLayer(material, convert_to_meter(FLOOR_THICKNESS), None)
-        material_layer_set = model.createIfcMaterialLayerSet([material_layer], None)
-        material_layer_set_usage = model.createIfcMaterialLayerSetUsage(material_layer_set, "AXIS2", "POSITIVE", 0.0)
-        
+        # Create (or reuse) the material layer set
+        if material_name not in material_sets:
+            material_sets[material_name] = create_material_layer_set_usage(model, material_name, FLOOR_THICKNESS_M)
+
         # Create placement at the next floor level (bottom of the slab)
-        slab_placement = model.createIfcLocalPlacement(None,
-                                                    model.createIfcAxis2Placement3D(
-                                                        model.createIfcCartesianPoint([0.0, 0.0, next_elevation - convert_to_meter(FLOOR_THICKNESS)]),
-                                                        model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                        model.createIfcDirection([1.0, 0.0, 0.0])
-                                                    ))
+        slab_placement = get_local_placement(model, (0.0, 0.0, next_elevation - FLOOR_THICKNESS_M))
         
         # Create slab shape representation
-        extrusion = create_slab_extrusion(model, context, width, depth, convert_to_meter(FLOOR_THICKNESS))
+        extrusion = create_slab_extrusion(model, context, width, depth, FLOOR_THICKNESS_M)
         
         # Create slab
         slab_name = "Roof" if i == len(storeys) - 2 else f"Floor {i+1}"
@@ -349,134 +461,120 @@ def create_slabs(model, storeys, owner_history, context):
                                   f"{slab_name} of the brownstone", None,
                                   slab_placement, extrusion, None, slab_type)
         
-        # Assign material
-        model.createIfcRelAssociatesMaterial(create_guid(), owner_history, None, None, [slab], material_layer_set_usage)
-        
+        slabs_by_material.setdefault(material_name, []).append(slab)
+
         # Relate slab to storey
-        model.createIfcRelContainedInSpatialStructure(create_guid(), owner_history, 
-                                                    f"Storey {i} Slab", None, [slab], storeys[i+1])
-        
+        contained.setdefault(storeys[i+1], []).append(slab)
+
         all_slabs.append(slab)
     
     # Create roof slab
     top_storey = storeys[-1]
-    top_elevation = top_storey.Elevation
-    
+    top_elevation = elevations[-1]
+
     # Calculate width and depth in meters
-    width = convert_to_meter(BUILDING_WIDTH)
-    depth = convert_to_meter(BUILDING_DEPTH)
+    width = BUILDING_WIDTH_M
+    depth = BUILDING_DEPTH_M
     
     # Create roof material
-    roof_material = model.createIfcMaterial("Roof Membrane")
-    roof_material_layer = model.createIfcMaterialLayer(roof_material, convert_to_meter(ROOF_THICKNESS), None)
-    roof_material_layer_set = model.createIfcMaterialLayerSet([roof_material_layer], None)
-    roof_material_layer_set_usage = model.createIfcMaterialLayerSetUsage(roof_material_layer_set, "AXIS2", "POSITIVE", 0.0)
-    
+    material_sets["Roof Membrane"] = create_material_layer_set_usage(model, "Roof Membrane", ROOF_THICKNESS_M)
+
     # Create roof placement
-    roof_placement = model.createIfcLocalPlacement(None,
-                                                model.createIfcAxis2Placement3D(
-                                                    model.createIfcCartesianPoint([0.0, 0.0, top_elevation]),
-                                                    model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                    model.createIfcDirection([1.0, 0.0, 0.0])
-                                                ))
+    roof_placement = get_local_placement(model, (0.0, 0.0, top_elevation))
     
     # Create roof shape representation
-    roof_extrusion = create_slab_extrusion(model, context, width, depth, convert_to_meter(ROOF_THICKNESS))
+    roof_extrusion = create_slab_extrusion(model, context, width, depth, ROOF_THICKNESS_M)
     
     # Create roof
     roof = model.createIfcSlab(create_guid(), owner_history, "Roof Slab", 
                              "Roof of the brownstone", None,
                              roof_placement, roof_extrusion, None, "ROOF")
     
-    # Assign material
-    model.createIfcRelAssociatesMaterial(create_guid(), owner_history, None, None, [roof], roof_material_layer_set_usage)
-    
+    slabs_by_material.setdefault("Roof Membrane", []).append(roof)
+
     # Relate roof to top storey
-    model.createIfcRelContainedInSpatialStructure(create_guid(), owner_history, 
-                                                "Roof Slab", None, [roof], top_storey)
-    
+    contained.setdefault(top_storey, []).append(roof)
+
     all_slabs.append(roof)
-    
+
+    # Assign materials, one relationship per material
+    for material_name, material_slabs in slabs_by_material.items():
+        model.createIfcRelAssociatesMaterial(create_guid(), owner_history, None, None,
+                                            material_slabs, material_sets[material_name])
+
     return all_slabs
 
 def create_slab_extrusion(model, context, width, depth, thickness):
     """Create an extrusion for a slab"""
-    # Create profile
-    points = [
-        [0, 0],
-        [width, 0],
-        [width, depth],
-        [0, depth],
-        [0, 0]
-    ]
-    
-    polyline = model.createIfcPolyline([model.createIfcCartesianPoint(point) for point in points])
-    profile = model.createIfcArbitraryClosedProfileDef("AREA", None, polyline)
-    
+    # Reuse the shape if a slab with the same dimensions was already built
+    shape_key = _dim_key(model, "slab", width, depth, thickness)
+    if shape_key in _shape_cache:
+        return _shape_cache[shape_key]
+
+    # Create (or reuse) the profile
+    profile_key = _dim_key(model, "slab", width, depth)
+    profile = _profile_cache.get(profile_key)
+    if profile is None:
+        # Axis-aligned rectangle: a rectangle profile positioned at the
+        # centroid replaces the former 5-point polyline
+        position = model.createIfcAxis2Placement2D(get_point(model, (width/2, depth/2)), get_dir(model, (1.0, 0.0)))
+        profile = _profile_cache[profile_key] = model.createIfcRectangleProfileDef("AREA", None, position, width, depth)
+
     # Create extrusion
-    extrusion_direction = model.createIfcDirection([0.0, 0.0, 1.0])
+    extrusion_direction = get_dir(model, _Z)
     extrusion = model.createIfcExtrudedAreaSolid(profile,
-                                              model.createIfcAxis2Placement3D(
-                                                  model.createIfcCartesianPoint([0.0, 0.0, 0.0]),
-                                                  model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                  model.createIfcDirection([1.0, 0.0, 0.0])
-                                              ),
+                                              get_identity_placement(model),
                                               extrusion_direction,
                                               thickness)
-    
+
     # Create shape representation
     shape_representation = model.createIfcShapeRepresentation(context, "Body", "SweptSolid", [extrusion])
-    
+
     # Create product definition shape
     product_definition_shape = model.createIfcProductDefinitionShape(None, None, [shape_representation])
-    
+    _shape_cache[shape_key] = product_definition_shape
+
     return product_definition_shape
 
 def create_door_extrusion(model, context, width, height, thickness):
     """Create an extrusion for a door"""
-    # Create profile
-    points = [
-        [0, 0],
-        [width, 0],
-        [width, height],
-        [0, height],
-        [0, 0]
-    ]
-    
-    polyline = model.createIfcPolyline([model.createIfcCartesianPoint(point) for point in points])
-    profile = model.createIfcArbitraryClosedProfileDef("AREA", None, polyline)
-    
+    # Reuse the shape if a door with the same dimensions was already built
+    shape_key = _dim_key(model, "door", width, height, thickness)
+    if shape_key in _shape_cache:
+        return _shape_cache[shape_key]
+
+    # Create (or reuse) the profile
+    profile_key = _dim_key(model, "door", width, height)
+    profile = _profile_cache.get(profile_key)
+    if profile is None:
+        # Axis-aligned rectangle: a rectangle profile positioned at the
+        # centroid replaces the former 5-point polyline
+        position = model.createIfcAxis2Placement2D(get_point(model, (width/2, height/2)), get_dir(model, (1.0, 0.0)))
+        profile = _profile_cache[profile_key] = model.createIfcRectangleProfileDef("AREA", None, position, width, height)
+
     # Create extrusion
-    extrusion_direction = model.createIfcDirection([0.0, 1.0, 0.0])
+    extrusion_direction = get_dir(model, (0.0, 1.0, 0.0))
     extrusion = model.createIfcExtrudedAreaSolid(profile,
-                                              model.createIfcAxis2Placement3D(
-                                                  model.createIfcCartesianPoint([0.0, 0.0, 0.0]),
-                                                  model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                  model.createIfcDirection([1.0, 0.0, 0.0])
-                                              ),
+                                              get_identity_placement(model),
                                               extrusion_direction,
                                               thickness)
-    
+
     # Create shape representation
     shape_representation = model.createIfcShapeRepresentation(context, "Body", "SweptSolid", [extrusion])
-    
+
     # Create product definition shape
     product_definition_shape = model.createIfcProductDefinitionShape(None, None, [shape_representation])
-    
+    _shape_cache[shape_key] = product_definition_shape
+
     return product_definition_shape
 
 def create_door(model, owner_history, context, name, position, width, height):
     """Create a door with the given parameters"""
     # Create door placement
-    door_placement = model.createIfcLocalPlacement(None,
-                                                 model.createIfcAxis2Placement3D(
-                                                     model.createIfcCartesianPoint(position),
-                                                     model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                     model.createIfcDirection([1.0, 0.0, 0.0])
-                                                 ))
+    door_placement = get_local_placement(model, position)
     
     # Create door shape representation
-    extrusion = create_door_extrusion(model, context, width, height, convert_to_meter(WALL_THICKNESS))
+    extrusion = create_door_extrusion(model, context, width, height, WALL_THICKNESS_M)
     
     # Create door
     door = model.createIfcDoor(create_guid(), owner_history, name, 
@@ -484,105 +582,45 @@ def create_door(model, owner_history, context, name, position, width, height):
     
     return door
 
-def create_doors(model, storeys, owner_history, context):
-    """Create doors in the brownstone"""
-    all_doors = []
-    
-    # Create front door
-    front_door_width = convert_to_meter(4.0)
-    front_door_height = convert_to_meter(8.0)
-    
-    # Calculate building width in meters
-    building_width = convert_to_meter(BUILDING_WIDTH)
-    building_depth = convert_to_meter(BUILDING_DEPTH)
-    
-    # Create front door at the first floor (main entrance)
-    front_door_position = [building_width/2 - front_door_width/2, 0, storeys[1].Elevation]
-    front_door = create_door(model, owner_history, context,
-                           "Front Door",
-                           front_door_position,
-                           front_door_width, front_door_height)
-    all_doors.append(front_door)
-    
-    # Relate front door to first floor
-    model.createIfcRelContainedInSpatialStructure(create_guid(), owner_history, 
-                                                "Front Door", None, [front_door], storeys[1])
-    
-    # Create interior doors
-    for i, storey in enumerate(storeys[:-1]):  # Skip roof
-        storey_elevation = storey.Elevation
-        
-        # Skip basement for simplicity
-        if i == 0:
-            continue
-        
-        # Create interior doors
-        interior_doors = []
-        door_width = convert_to_meter(3.0)
-        door_height = convert_to_meter(7.0)
-        
-        # Doors along the central corridor
-        for j in range(2):
-            # Door positions along the central corridor
-            door_position = [building_width/3 * (j+1), building_depth/2, storey_elevation]
-            door = create_door(model, owner_history, context,
-                             f"Interior Door {i}-{j}",
-                             door_position,
-                             door_width, door_height)
-            interior_doors.append(door)
-        
-        # Relate interior doors to storey
-        all_doors.extend(interior_doors)
-        model.createIfcRelContainedInSpatialStructure(create_guid(), owner_history, 
-                                                    f"Storey {i} Doors", None, interior_doors, storey)
-    
-    return all_doors
-
 def create_window_extrusion(model, context, width, height, thickness):
     """Create an extrusion for a window"""
-    # Create profile
-    points = [
-        [0, 0],
-        [width, 0],
-        [width, height],
-        [0, height],
-        [0, 0]
-    ]
-    
-    polyline = model.createIfcPolyline([model.createIfcCartesianPoint(point) for point in points])
-    profile = model.createIfcArbitraryClosedProfileDef("AREA", None, polyline)
-    
+    # Reuse the shape if a window with the same dimensions was already built
+    shape_key = _dim_key(model, "window", width, height, thickness)
+    if shape_key in _shape_cache:
+        return _shape_cache[shape_key]
+
+    # Create (or reuse) the profile
+    profile_key = _dim_key(model, "window", width, height)
+    profile = _profile_cache.get(profile_key)
+    if profile is None:
+        # Axis-aligned rectangle: a rectangle profile positioned at the
+        # centroid replaces the former 5-point polyline
+        position = model.createIfcAxis2Placement2D(get_point(model, (width/2, height/2)), get_dir(model, (1.0, 0.0)))
+        profile = _profile_cache[profile_key] = model.createIfcRectangleProfileDef("AREA", None, position, width, height)
+
     # Create extrusion
-    extrusion_direction = model.createIfcDirection([0.0, 1.0, 0.0])
+    extrusion_direction = get_dir(model, (0.0, 1.0, 0.0))
     extrusion = model.createIfcExtrudedAreaSolid(profile,
-                                              model.createIfcAxis2Placement3D(
-                                                  model.createIfcCartesianPoint([0.0, 0.0, 0.0]),
-                                                  model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                  model.createIfcDirection([1.0, 0.0, 0.0])
-                                              ),
+                                              get_identity_placement(model),
                                               extrusion_direction,
                                               thickness)
-    
+
     # Create shape representation
     shape_representation = model.createIfcShapeRepresentation(context, "Body", "SweptSolid", [extrusion])
-    
+
     # Create product definition shape
     product_definition_shape = model.createIfcProductDefinitionShape(None, None, [shape_representation])
-    
+    _shape_cache[shape_key] = product_definition_shape
+
     return product_definition_shape
 
 def create_window(model, owner_history, context, name, position, width, height):
     """Create a window with the given parameters"""
     # Create window placement
-    window_placement = model.createIfcLocalPlacement(None,
-                                                   model.createIfcAxis2Placement3D(
-                                                       model.createIfcCartesianPoint(position),
-                                                       model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                       model.createIfcDirection([1.0, 0.0, 0.0])
-                                                   ))
+    window_placement = get_local_placement(model, position)
     
     # Create window shape representation
-    extrusion = create_window_extrusion(model, context, width, height, convert_to_meter(WALL_THICKNESS))
+    extrusion = create_window_extrusion(model, context, width, height, WALL_THICKNESS_M)
     
     # Create window
     window = model.createIfcWindow(create_guid(), owner_history, name, 
@@ -590,10 +628,11 @@ def create_window(model, owner_history, context, name, position, width, height):
     
     return window
 
-def create_windows(model, storeys, owner_history, context):
-    """Create windows on the front and back facades"""
+def create_openings(model, storeys, owner_history, context, contained):
+    """Create the doors and windows in a single pass over the storeys"""
+    all_doors = []
     all_windows = []
-    
+
     # Window properties for each floor
     window_heights = {
         0: 3.0,  # Basement
@@ -602,7 +641,7 @@ def create_windows(model, storeys, owner_history, context):
         3: 6.0,  # Third Floor
         4: 6.0,  # Fourth Floor
     }
-    
+
     window_widths = {
         0: 3.0,  # Basement
         1: 3.5,  # First Floor
@@ -610,105 +649,96 @@ def create_windows(model, storeys, owner_history, context):
         3: 3.5,  # Third Floor
         4: 3.5,  # Fourth Floor
     }
-    
+
+    building_width = BUILDING_WIDTH_M
+    building_depth = BUILDING_DEPTH_M
+
+    # Door dimensions
+    front_door_width = convert_to_meter(4.0)
+    front_door_height = convert_to_meter(8.0)
+    door_width = convert_to_meter(3.0)
+    door_height = convert_to_meter(7.0)
+
+    # Window sill height (distance from floor to bottom of window)
+    sill_height = convert_to_meter(3.0)
+
+    # Corridor door x-positions are the same on every storey
+    door_xs = building_width * np.arange(1, 3) / 3
+
+    # Read all elevations up front rather than per iteration
+    elevations = [storey.Elevation for storey in storeys[:-1]]
+
     # Skip the roof "storey"
     for i, storey in enumerate(storeys[:-1]):
+        storey_elevation = elevations[i]
+        storey_openings = []
+
+        if i == 1:
+            # Create front door at the first floor (main entrance)
+            front_door = create_door(model, owner_history, context,
+                                   "Front Door",
+                                   (building_width/2 - front_door_width/2, 0, storey_elevation),
+                                   front_door_width, front_door_height)
+            all_doors.append(front_door)
+            storey_openings.append(front_door)
+
+        if i > 0:
+            # Interior doors along the central corridor (skip basement for simplicity)
+            for j, door_x in enumerate(door_xs):
+                door = create_door(model, owner_history, context,
+                                 f"Interior Door {i}-{j}",
+                                 (door_x, building_depth/2, storey_elevation),
+                                 door_width, door_height)
+                all_doors.append(door)
+                storey_openings.append(door)
+
         # Skip basement for front windows (brownstones typically have fewer/smaller basement windows)
         if i == 0:
             window_count = 2  # Fewer windows in basement
         else:
             window_count = 3  # Standard floors
-        
-        # Get the storey elevation
-        storey_elevation = storey.Elevation
-        
-        # Calculate width in meters
-        building_width = convert_to_meter(BUILDING_WIDTH)
-        building_depth = convert_to_meter(BUILDING_DEPTH)
-        
+
         # Window dimensions
         window_width = convert_to_meter(window_widths[i])
         window_height = convert_to_meter(window_heights[i])
-        
-        # Window sill height (distance from floor to bottom of window)
-        sill_height = convert_to_meter(3.0)
-        
+
+        # Window x-positions across the facade, computed once per storey
+        # and shared by the front and back loops
+        if window_count == 1:
+            x_positions = np.array([building_width / 2 - window_width / 2])
+        else:
+            x_positions = building_width * np.arange(1, window_count + 1) / (window_count + 1) - window_width / 2
+
         # Create front windows
-        front_windows = []
-        for j in range(window_count):
-            # Calculate window position
-            if window_count == 1:
-                x_position = building_width / 2 - window_width / 2
-            else:
-                x_position = building_width * (j + 1) / (window_count + 1) - window_width / 2
-            
-            # Create window
+        for j, x_position in enumerate(x_positions):
             window = create_window(model, owner_history, context,
                                   f"Front Window {i}-{j}",
-                                  [x_position, 0, storey_elevation + sill_height],
+                                  (x_position, 0, storey_elevation + sill_height),
                                   window_width, window_height)
-            front_windows.append(window)
-        
+            all_windows.append(window)
+            storey_openings.append(window)
+
         # Create back windows
-        back_windows = []
-        for j in range(window_count):
-            # Calculate window position
-            if window_count == 1:
-                x_position = building_width / 2 - window_width / 2
-            else:
-                x_position = building_width * (j + 1) / (window_count + 1) - window_width / 2
-            
-            # Create window
+        for j, x_position in enumerate(x_positions):
             window = create_window(model, owner_history, context,
                                   f"Back Window {i}-{j}",
-                                  [x_position, building_depth, storey_elevation + sill_height],
+                                  (x_position, building_depth, storey_elevation + sill_height),
                                   window_width, window_height)
-            back_windows.append(window)
-        
-        # Relate windows to storey
-        all_windows.extend(front_windows)
-        all_windows.extend(back_windows)
-        
-        model.createIfcRelContainedInSpatialStructure(create_guid(), owner_history, 
-                                                    f"Storey {i} Windows", None, 
-                                                    front_windows + back_windows, storey)
-    
-    return all_windows
+            all_windows.append(window)
+            storey_openings.append(window)
+
+        # Relate the storey's doors and windows to it
+        contained.setdefault(storey, []).extend(storey_openings)
+
+    return all_doors, all_windows
 
 def create_stoop_extrusion(model, context, width, depth, height):
     """Create an extrusion for the stoop"""
-    # Create profile for base
-    points = [
-        [0, 0],
-        [width, 0],
-        [width, depth],
-        [0, depth],
-        [0, 0]
-    ]
-    
-    polyline = model.createIfcPolyline([model.createIfcCartesianPoint(point) for point in points])
-    profile = model.createIfcArbitraryClosedProfileDef("AREA", None, polyline)
-    
-    # Create extrusion for base
-    extrusion_direction = model.createIfcDirection([0.0, 0.0, 1.0])
-    extrusion = model.createIfcExtrudedAreaSolid(profile,
-                                              model.createIfcAxis2Placement3D(
-                                                  model.createIfcCartesianPoint([0.0, 0.0, 0.0]),
-                                                  model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                  model.createIfcDirection([1.0, 0.0, 0.0])
-                                              ),
-                                              extrusion_direction,
-                                              height)
-    
-    # Create shape representation
-    shape_representation = model.createIfcShapeRepresentation(context, "Body", "SweptSolid", [extrusion])
-    
-    # Create product definition shape
-    product_definition_shape = model.createIfcProductDefinitionShape(None, None, [shape_representation])
-    
-    return product_definition_shape
+    # The stoop is a plain box, so its geometry is shared with any other
+    # box extrusion (fixtures, MEP equipment) of the same dimensions
+    return create_box_extrusion(model, context, width, depth, height)
 
-def create_stoop(model, storeys, owner_history, context):
+def create_stoop(model, storeys, owner_history, context, contained, material_sets, products_by_material):
     """Create the front stoop typical of brownstones"""
     # Stoop dimensions
     stoop_width = convert_to_meter(12.0)
@@ -716,19 +746,14 @@ def create_stoop(model, storeys, owner_history, context):
     stoop_height = convert_to_meter(5.0)
     
     # Calculate building dimensions in meters
-    building_width = convert_to_meter(BUILDING_WIDTH)
-    building_depth = convert_to_meter(BUILDING_DEPTH)
+    building_width = BUILDING_WIDTH_M
+    building_depth = BUILDING_DEPTH_M
     
     # Position stoop centered on the front of the building, at the first floor level
-    stoop_position = [building_width/2 - stoop_width/2, -stoop_depth, 0]
+    stoop_position = (building_width/2 - stoop_width/2, -stoop_depth, 0)
     
     # Create stoop placement
-    stoop_placement = model.createIfcLocalPlacement(None,
-                                                 model.createIfcAxis2Placement3D(
-                                                     model.createIfcCartesianPoint(stoop_position),
-                                                     model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                     model.createIfcDirection([1.0, 0.0, 0.0])
-                                                 ))
+    stoop_placement = get_local_placement(model, stoop_position)
     
     # Create stoop shape representation
     extrusion = create_stoop_extrusion(model, context, stoop_width, stoop_depth, stoop_height)
@@ -738,64 +763,64 @@ def create_stoop(model, storeys, owner_history, context):
                                 "Brownstone front stoop", None,
                                 stoop_placement, extrusion, None, "STRAIGHT")
     
-    # Create stoop material
-    stoop_material = model.createIfcMaterial("Brownstone")
-    material_association = model.createIfcMaterialLayerSetUsage(
-        model.createIfcMaterialLayerSet([model.createIfcMaterialLayer(stoop_material, 0.2, None)], None),
-        "AXIS2", "POSITIVE", 0.0
-    )
-    
-    # Associate material with stoop
-    model.createIfcRelAssociatesMaterial(create_guid(), owner_history, None, None, [stoop], material_association)
+    # Create (or reuse) the stoop material
+    if "Brownstone" not in material_sets:
+        material_sets["Brownstone"] = create_material_layer_set_usage(model, "Brownstone", 0.2)
+    products_by_material.setdefault("Brownstone", []).append(stoop)
     
     # Relate stoop to first floor storey
-    model.createIfcRelContainedInSpatialStructure(create_guid(), owner_history, 
-                                                "Stoop", None, [stoop], storeys[1])
+    contained.setdefault(storeys[1], []).append(stoop)
     
     return stoop
 
 def create_fixture_extrusion(model, context, width, depth, height):
     """Create an extrusion for a fixture"""
-    # Create profile
-    points = [
-        [0, 0],
-        [width, 0],
-        [width, depth],
-        [0, depth],
-        [0, 0]
-    ]
-    
-    polyline = model.createIfcPolyline([model.createIfcCartesianPoint(point) for point in points])
-    profile = model.createIfcArbitraryClosedProfileDef("AREA", None, polyline)
-    
+    return create_box_extrusion(model, context, width, depth, height)
+
+def create_box_extrusion(model, context, width, depth, height):
+    """Create (or reuse) a box extrusion with the given dimensions"""
+    # Reuse the shape if a box with the same dimensions was already built
+    shape_key = _dim_key(model, "box", width, depth, height)
+    if shape_key in _shape_cache:
+        return _shape_cache[shape_key]
+
+    # Create (or reuse) the profile
+    profile_key = _dim_key(model, "box", width, depth)
+    profile = _profile_cache.get(profile_key)
+    if profile is None:
+        # Closure back to the first point is implicit for a closed profile, so
+        # the rectangle needs only its four corners
+        points = (
+            (0, 0),
+            (width, 0),
+            (width, depth),
+            (0, depth)
+        )
+
+        polyline = model.createIfcPolyline([get_point(model, point) for point in points])
+        profile = _profile_cache[profile_key] = model.createIfcArbitraryClosedProfileDef("AREA", None, polyline)
+
     # Create extrusion
-    extrusion_direction = model.createIfcDirection([0.0, 0.0, 1.0])
+    extrusion_direction = get_dir(model, _Z)
     extrusion = model.createIfcExtrudedAreaSolid(profile,
-                                              model.createIfcAxis2Placement3D(
-                                                  model.createIfcCartesianPoint([0.0, 0.0, 0.0]),
-                                                  model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                  model.createIfcDirection([1.0, 0.0, 0.0])
-                                              ),
+                                              get_identity_placement(model),
                                               extrusion_direction,
                                               height)
-    
+
     # Create shape representation
     shape_representation = model.createIfcShapeRepresentation(context, "Body", "SweptSolid", [extrusion])
-    
+
     # Create product definition shape
     product_definition_shape = model.createIfcProductDefinitionShape(None, None, [shape_representation])
-    
+    _shape_cache[shape_key] = product_definition_shape
+
     return product_definition_shape
 
-def create_fixture(model, owner_history, context, name, position, width, depth, height, fixture_type):
+def create_fixture(model, owner_history, context, name, position, width, depth, height, fixture_type,
+                   material_sets, products_by_material):
     """Create a sanitary fixture"""
     # Create fixture placement
-    fixture_placement = model.createIfcLocalPlacement(None,
-                                                   model.createIfcAxis2Placement3D(
-                                                       model.createIfcCartesianPoint(position),
-                                                       model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                       model.createIfcDirection([1.0, 0.0, 0.0])
-                                                   ))
+    fixture_placement = get_local_placement(model, position)
     
     # Create fixture shape representation
     extrusion = create_fixture_extrusion(model, context, width, depth, height)
@@ -805,100 +830,94 @@ def create_fixture(model, owner_history, context, name, position, width, depth,
                                            f"Sanitary fixture", None,
                                            fixture_placement, extrusion, None, fixture_type)
     
-    # Create fixture material
+    # Create (or reuse) the fixture material
     if fixture_type == "SINK":
         material_name = "Porcelain"
     else:
         material_name = "Ceramic"
     
-    fixture_material = model.createIfcMaterial(material_name)
-    material_association = model.createIfcMaterialLayerSetUsage(
-        model.createIfcMaterialLayerSet([model.createIfcMaterialLayer(fixture_material, 0.05, None)], None),
-        "AXIS2", "POSITIVE", 0.0
-    )
-    
-    # Associate material with fixture
-    model.createIfcRelAssociatesMaterial(create_guid(), owner_history, None, None, [fixture], material_association)
+    if material_name not in material_sets:
+        material_sets[material_name] = create_material_layer_set_usage(model, material_name, 0.05)
+    products_by_material.setdefault(material_name, []).append(fixture)
     
     return fixture
 
-def create_fixtures(model, storeys, owner_history, context):
+def create_fixtures(model, storeys, owner_history, context, contained, material_sets, products_by_material):
     """Create simplified fixtures in the brownstone"""
     all_fixtures = []
     
     # Kitchen fixtures on first floor
-    building_width = convert_to_meter(BUILDING_WIDTH)
-    building_depth = convert_to_meter(BUILDING_DEPTH)
+    building_width = BUILDING_WIDTH_M
+    building_depth = BUILDING_DEPTH_M
     
     # Create kitchen sink
     sink_width = convert_to_meter(3.0)
     sink_depth = convert_to_meter(2.0)
     sink_height = convert_to_meter(0.5)
     
-    sink_position = [building_width * 0.25, building_depth * 0.3, storeys[1].Elevation + convert_to_meter(3.0)]
+    sink_position = (building_width * 0.25, building_depth * 0.3, storeys[1].Elevation + convert_to_meter(3.0))
     
     sink = create_fixture(model, owner_history, context,
                          "Kitchen Sink",
                          sink_position,
                          sink_width, sink_depth, sink_height,
-                         "SINK")
+                         "SINK", material_sets, products_by_material)
     all_fixtures.append(sink)
     
     # Create bathroom fixtures on upper floors
+    # Dimensions and in-plan positions are the same on every floor, so
+    # compute them once above the loop
+    toilet_width = convert_to_meter(1.5)
+    toilet_depth = convert_to_meter(2.0)
+    toilet_height = convert_to_meter(1.0)
+    
+    bath_sink_width = convert_to_meter(2.0)
+    bath_sink_depth = convert_to_meter(1.5)
+    bath_sink_height = convert_to_meter(0.5)
+    
+    fixture_x = building_width * 0.75
+    toilet_y = building_depth * 0.25
+    bath_sink_y = building_depth * 0.35
+    bath_sink_z = convert_to_meter(3.0)
+    
     for i in range(2, 5):  # Floors 2-4
         storey = storeys[i]
         
         # Create toilet
-        toilet_width = convert_to_meter(1.5)
-        toilet_depth = convert_to_meter(2.0)
-        toilet_height = convert_to_meter(1.0)
-        
-        toilet_position = [building_width * 0.75, building_depth * 0.25, storey.Elevation + convert_to_meter(0.0)]
+        toilet_position = (fixture_x, toilet_y, storey.Elevation)
         
         toilet = create_fixture(model, owner_history, context,
                               f"Toilet Floor {i}",
                               toilet_position,
                               toilet_width, toilet_depth, toilet_height,
-                              "WCCISTERN")
-        all_fixtures.append(toilet)
+                              "WCCISTERN", material_sets, products_by_material)
         
         # Create sink
-        bath_sink_width = convert_to_meter(2.0)
-        bath_sink_depth = convert_to_meter(1.5)
-        bath_sink_height = convert_to_meter(0.5)
-        
-        bath_sink_position = [building_width * 0.75, building_depth * 0.35, storey.Elevation + convert_to_meter(3.0)]
+        bath_sink_position = (fixture_x, bath_sink_y, storey.Elevation + bath_sink_z)
         
         bath_sink = create_fixture(model, owner_history, context,
                                  f"Bathroom Sink Floor {i}",
                                  bath_sink_position,
                                  bath_sink_width, bath_sink_depth, bath_sink_height,
-                                 "SINK")
-        all_fixtures.append(bath_sink)
+                                 "SINK", material_sets, products_by_material)
+        all_fixtures.extend((toilet, bath_sink))
         
         # Relate fixtures to their storeys
-        model.createIfcRelContainedInSpatialStructure(create_guid(), owner_history, 
-                                                    f"Storey {i} Fixtures", None,
-                                                    [toilet, bath_sink], storey)
+        contained.setdefault(storey, []).extend((toilet, bath_sink))
     
     # Relate kitchen fixtures to first floor
-    model.createIfcRelContainedInSpatialStructure(create_guid(), owner_history, 
-                                                "Kitchen Fixtures", None, [sink], storeys[1])
+    contained.setdefault(storeys[1], []).append(sink)
     
     return all_fixtures
 
-def create_mep_element(model, owner_history, context, name, position, width, depth, height, element_type):
+def create_mep_element(model, owner_history, context, name, position, width, depth, height, element_type,
+                       material_sets, products_by_material):
     """Create an MEP element"""
     # Create element placement
-    element_placement = model.createIfcLocalPlacement(None,
-                                                    model.createIfcAxis2Placement3D(
-                                                        model.createIfcCartesianPoint(position),
-                                                        model.createIfcDirection([0.0, 0.0, 1.0]),
-                                                        model.createIfcDirection([1.0, 0.0, 0.0])
-                                                    ))
+    element_placement = get_local_placement(model, position)
     
     # Create element shape representation
-    extrusion = create_fixture_extrusion(model, context, width, depth, height)  # Reuse fixture extrusion function
+    extrusion = create_box_extrusion(model, context, width, depth, height)
     
     # Create element based on type
     if element_type == "AIRHANDLER":
@@ -914,38 +933,36 @@ def create_mep_element(model, owner_history, context, name, position, width, dep
                                             "Plumbing equipment", None,
                                             element_placement, extrusion, None, None)
     
-    # Create element material
-    element_material = model.createIfcMaterial("Metal")
-    material_association = model.createIfcMaterialLayerSetUsage(
-        model.createIfcMaterialLayerSet([model.createIfcMaterialLayer(element_material, 0.05, None)], None),
-        "AXIS2", "POSITIVE", 0.0
-    )
-    
-    # Associate material with element
-    model.createIfcRelAssociatesMaterial(create_guid(), owner_history, None, None, [element], material_association)
+    # Create (or reuse) the element material
+    if "Metal" not in material_sets:
+        material_sets["Metal"] = create_material_layer_set_usage(model, "Metal", 0.05)
+    products_by_material.setdefault("Metal", []).append(element)
     
     return element
 
-def create_mep_elements(model, storeys, owner_history, context):
+def create_mep_elements(model, storeys, owner_history, context, contained, material_sets, products_by_material):
     """Create simplified MEP elements in the brownstone"""
     all_mep_elements = []
     
     # Building dimensions
-    building_width = convert_to_meter(BUILDING_WIDTH)
-    building_depth = convert_to_meter(BUILDING_DEPTH)
+    building_width = BUILDING_WIDTH_M
+    building_depth = BUILDING_DEPTH_M
     
     # Create HVAC system in basement
     hvac_width = convert_to_meter(6.0)
     hvac_depth = convert_to_meter(4.0)
     hvac_height = convert_to_meter(2.0)
     
-    hvac_position = [building_width * 0.2, building_depth * 0.2, storeys[0].Elevation + convert_to_meter(1.0)]
+    # All three units sit one foot above the basement slab
+    basement_elevation = storeys[0].Elevation + convert_to_meter(1.0)
+    
+    hvac_position = (building_width * 0.2, building_depth * 0.2, basement_elevation)
     
     hvac_unit = create_mep_element(model, owner_history, context,
                                  "HVAC System",
                                  hvac_position,
                                  hvac_width, hvac_depth, hvac_height,
-                                 "AIRHANDLER")
+                                 "AIRHANDLER", material_sets, products_by_material)
     all_mep_elements.append(hvac_unit)
     
     # Create electrical panel in basement
@@ -953,13 +970,13 @@ def create_mep_elements(model, storeys, owner_history, context):
     panel_depth = convert_to_meter(0.5)
     panel_height = convert_to_meter(3.0)
     
-    panel_position = [building_width * 0.8, building_depth * 0.1, storeys[0].Elevation + convert_to_meter(1.0)]
+    panel_position = (building_width * 0.8, building_depth * 0.1, basement_elevation)
     
     electrical_panel = create_mep_element(model, owner_history, context,
                                         "Electrical Panel",
                                         panel_position,
                                         panel_width, panel_depth, panel_height,
-                                        "SWITCHBOARD")
+                                        "SWITCHBOARD", material_sets, products_by_material)
     all_mep_elements.append(electrical_panel)
     
     # Create water heater in basement
@@ -967,19 +984,17 @@ def create_mep_elements(model, storeys, owner_history, context):
     water_heater_depth = convert_to_meter(2.0)
     water_heater_height = convert_to_meter(2.0)
     
-    water_heater_position = [building_width * 0.5, building_depth * 0.1, storeys[0].Elevation + convert_to_meter(1.0)]
+    water_heater_position = (building_width * 0.5, building_depth * 0.1, basement_elevation)
     
     water_heater = create_mep_element(model, owner_history, context,
                                     "Water Heater",
                                     water_heater_position,
                                     water_heater_width, water_heater_depth, water_heater_height,
-                                    "WATERHEATER")
+                                    "WATERHEATER", material_sets, products_by_material)
     all_mep_elements.append(water_heater)
     
     # Relate MEP elements to basement
-    model.createIfcRelContainedInSpatialStructure(create_guid(), owner_history, 
-                                                "MEP Systems", None,
-                                                [hvac_unit, electrical_panel, water_heater], storeys[0])
+    contained.setdefault(storeys[0], []).extend(all_mep_elements)
     
     return all_mep_elements
 
@@ -989,7 +1004,13 @@ def create_brownstone_ifc(output_file="new_york_brownstone.ifc"):
     
     # Create the IFC model
     model, project, owner_history, context = create_ifc_model()
-    
+
+    # Defer inverse-reference bookkeeping to a single rebuild at the end of
+    # authoring (supported by IfcOpenShell 0.7+); per-entity maintenance is
+    # a known hot spot when adding many entities
+    if hasattr(model, "batch"):
+        model.batch()
+
     # Create site
     site = create_site(model, project, owner_history)
     
@@ -999,36 +1020,65 @@ def create_brownstone_ifc(output_file="new_york_brownstone.ifc"):
     # Create storeys (including roof level)
     storeys = create_storeys(model, building, owner_history)
     
+    # Spatial containment is collected per storey and emitted as one
+    # relationship per storey after all elements are created
+    contained = {}
+
+    # Stoop, fixture and MEP materials are shared the same way, with one
+    # material association per material at the end
+    material_sets = {}
+    products_by_material = {}
+
     # Create walls
-    walls = create_walls(model, storeys, owner_history, context)
+    walls = create_walls(model, storeys, owner_history, context, contained)
     print(f"Created {len(walls)} walls")
-    
+
     # Create slabs (floors and roof)
-    slabs = create_slabs(model, storeys, owner_history, context)
+    slabs = create_slabs(model, storeys, owner_history, context, contained)
     print(f"Created {len(slabs)} slabs")
-    
-    # Create windows
-    windows = create_windows(model, storeys, owner_history, context)
+
+    # Create doors and windows in one pass over the storeys
+    doors, windows = create_openings(model, storeys, owner_history, context, contained)
     print(f"Created {len(windows)} windows")
-    
-    # Create doors
-    doors = create_doors(model, storeys, owner_history, context)
     print(f"Created {len(doors)} doors")
     
     # Create front stoop
-    stoop = create_stoop(model, storeys, owner_history, context)
+    stoop = create_stoop(model, storeys, owner_history, context, contained,
+                         material_sets, products_by_material)
     print("Created front stoop")
     
     # Create fixtures (sinks, toilets, etc.)
-    fixtures = create_fixtures(model, storeys, owner_history, context)
+    fixtures = create_fixtures(model, storeys, owner_history, context, contained,
+                               material_sets, products_by_material)
     print(f"Created {len(fixtures)} fixtures")
     
     # Create MEP elements
-    mep_elements = create_mep_elements(model, storeys, owner_history, context)
+    mep_elements = create_mep_elements(model, storeys, owner_history, context, contained,
+                                       material_sets, products_by_material)
     print(f"Created {len(mep_elements)} MEP elements")
-    
+
+    # Relate collected elements to their storeys, one relationship per storey
+    for storey, elements in contained.items():
+        model.createIfcRelContainedInSpatialStructure(create_guid(), owner_history,
+                                                    "Storey Contents", None, elements, storey)
+
+    # Assign the shared materials, one relationship per material
+    for material_name, products in products_by_material.items():
+        model.createIfcRelAssociatesMaterial(create_guid(), owner_history, None, None,
+                                            products, material_sets[material_name])
+
+    if hasattr(model, "unbatch"):
+        model.unbatch()
+
     # Write the model to a file
-    model.write(output_file)
+    # Serialize the whole model in one shot and write it through a large
+    # buffer instead of the default per-line write path; fall back to the
+    # built-in writer on builds without to_string
+    if hasattr(model, "to_string"):
+        with open(output_file, 'wb', buffering=4 << 20) as f:
+            f.write(model.to_string().encode())
+    else:
+        model.write(output_file)
     print(f"IFC model written to {output_file}")
     
     return output_file
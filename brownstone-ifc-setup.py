@@ -12,6 +12,9 @@ import platform
 import os
 from pathlib import Path
 
+# Queried once; platform.system() shells out on some platforms
+_SYSTEM = platform.system().lower()
+
 def check_python_version():
     """Check if Python version is 3.7 or newer"""
     python_version = sys.version_info
@@ -37,21 +40,21 @@ def check_pip():
             print("Failed to install pip. Please install pip manually.")
             return False
 
-def install_package(package_name):
-    """Install a Python package using pip"""
-    print(f"Installing {package_name}...")
+def install_packages(package_names):
+    """Install Python packages with a single pip invocation"""
+    print(f"Installing {', '.join(package_names)}...")
     try:
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', package_name], 
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', *package_names], 
                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        print(f"Successfully installed {package_name}")
+        print(f"Successfully installed {', '.join(package_names)}")
         return True
     except subprocess.CalledProcessError:
-        print(f"Failed to install {package_name}")
+        print(f"Failed to install {', '.join(package_names)}")
         return False
 
 def install_ifcopenshell():
     """Install IfcOpenShell"""
-    system = platform.system().lower()
+    system = _SYSTEM
     machine = platform.machine().lower()
     python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
     
@@ -133,11 +136,13 @@ def setup():
     if missing_packages:
         print("\nInstalling missing packages...")
         
-        # Install numpy and pyvista first if needed
-        for package in missing_packages[:]:
-            if package and package != 'ifcopenshell':
-                if install_package(package):
-                    missing_packages.remove(package)
+        # Install numpy and pyvista first if needed, in one pip call
+        # rather than one interpreter start per package
+        regular_packages = [package for package in missing_packages
+                            if package and package != 'ifcopenshell']
+        if regular_packages and install_packages(regular_packages):
+            for package in regular_packages:
+                missing_packages.remove(package)
         
         # Handle IfcOpenShell separately
         if 'ifcopenshell' in missing_packages:
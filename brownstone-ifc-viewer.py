@@ -22,6 +22,9 @@ import pyvista as pv
 import sys
 import os
 import argparse
+import multiprocessing
+
+from _viewer_kernels import _build_faces, _offset_faces
 
 def setup_style():
     """Set up visualization style"""
@@ -42,43 +45,42 @@ def setup_style():
     
     return colors
 
-def create_entity_mesh(settings, entity, colors):
-    """Create a mesh for a single IFC entity"""
-    # Get shape data
-    shape = ifcopenshell.geom.create_shape(settings, entity)
-    
-    # Extract geometry data
-    verts = shape.geometry.verts
-    faces = shape.geometry.faces
-    
-    # Reshape vertices and faces
-    vertices = np.array(verts).reshape(-1, 3)
-    faces_count = len(faces) // 3
-    faces_array = np.array(faces).reshape(faces_count, 3)
-    
-    # Create face arrays with count of vertices per face (always 3 for triangles)
-    faces_with_count = np.column_stack((np.ones(faces_count, dtype=np.int8) * 3, faces_array))
-    faces_with_count = faces_with_count.flatten()
-    
-    # Create mesh
-    mesh = pv.PolyData(vertices, faces_with_count)
-    
-    # Assign color based on entity type
-    entity_type = entity.is_a()
-    if entity_type in colors:
-        color = colors[entity_type]
-    else:
-        color = colors['default']
-    
-    # Add color information
-    if len(color) == 3:
-        mesh['color'] = color
-        mesh['opacity'] = 1.0
-    else:
-        mesh['color'] = color[:3]
-        mesh['opacity'] = color[3]
-    
-    return mesh, entity_type
+def create_entity_mesh(shape, buffers):
+    """Append one tessellated shape's geometry to its type's buffers"""
+    verts_buf, faces_buf, vert_counts, face_counts = buffers
+
+    # Append the raw bytes through a memoryview: += on the ndarray itself
+    # would dispatch to numpy broadcasting, not bytearray concatenation
+    vertices = np.asarray(shape.geometry.verts, dtype=np.float64)
+    faces = np.asarray(shape.geometry.faces, dtype=np.int32)
+    verts_buf += memoryview(vertices).cast('B')
+    faces_buf += memoryview(faces).cast('B')
+    vert_counts.append(len(vertices) // 3)
+    face_counts.append(len(faces))
+
+def iter_shapes(iterator):
+    """Yield tessellated shapes from a geometry iterator as they finish"""
+    if iterator.initialize():
+        while True:
+            yield iterator.get()
+            if not iterator.next():
+                break
+
+def combine_meshes(verts_buf, faces_buf, vert_counts, face_counts):
+    """Build one PolyData from a type's accumulated geometry buffers"""
+    # One no-copy view over each byte buffer instead of per-entity arrays
+    vertices = np.frombuffer(verts_buf, dtype=np.float64).reshape(-1, 3)
+    faces_flat = np.frombuffer(faces_buf, dtype=np.int32)
+
+    # Face indices are local to each entity; remap them to the combined
+    # vertex array and interleave the per-face vertex count (always 3 for
+    # triangles) in the compiled kernels
+    _offset_faces(faces_flat,
+                  np.asarray(vert_counts, dtype=np.int64),
+                  np.asarray(face_counts, dtype=np.int64))
+    all_faces = _build_faces(faces_flat, faces_flat.shape[0] // 3)
+
+    return pv.PolyData(vertices, all_faces)
 
 def visualize_ifc(ifc_file):
     """Visualize an IFC file using PyVista"""
@@ -105,42 +107,51 @@ def visualize_ifc(ifc_file):
         'IfcElectricDistributionBoard', 'IfcFlowTerminal'
     ]
     
+    # Flatten the style dict into one RGBA table indexed by type id, so
+    # color and opacity come from a single array lookup
+    type_to_idx = {name: i for i, name in enumerate(entity_types)}
+    color_lut = np.ones((len(entity_types), 4), dtype=np.float32)
+    for name, idx in type_to_idx.items():
+        rgba = colors.get(name, colors['default'])
+        color_lut[idx, :len(rgba)] = rgba
+    
     # Process entities in groups to show progress
     entity_count = 0
-    meshes_by_type = {}
-    
-    # Initialize counts by type
-    for entity_type in entity_types:
-        meshes_by_type[entity_type] = []
     
-    # Process all entities of the specified types
+    # Per-type append-only byte buffers for vertices and faces, plus the
+    # per-entity counts needed to remap face indices afterwards
+    buffers_by_type = {}
     for entity_type in entity_types:
-        entities = model.by_type(entity_type)
-        print(f"Processing {len(entities)} {entity_type} entities...")
+        buffers_by_type[entity_type] = (bytearray(), bytearray(), [], [])
+    
+    # Tessellate all entities through the built-in iterator, which runs
+    # the geometry kernel on a thread pool, and stream the raw geometry
+    # bytes into the buffers rather than building a PolyData per entity
+    print(f"Tessellating entities on {multiprocessing.cpu_count()} threads...")
+    iterator = ifcopenshell.geom.iterator(settings, model, multiprocessing.cpu_count())
+    # One dict probe per shape decides both "is this type wanted" and
+    # which buffers it streams into
+    get_buffers = buffers_by_type.get
+    for shape in iter_shapes(iterator):
+        buffers = get_buffers(shape.type)
+        if buffers is not None:
+            create_entity_mesh(shape, buffers)
+            entity_count += 1
+    
+    # Combine each type's buffers into one mesh and add it to the plotter
+    # once per type. Buffers are popped as they are consumed so the byte
+    # accumulators and VTK's copies of them never all coexist.
+    shown_types = [entity_type for entity_type, buffers in buffers_by_type.items() if buffers[2]]
+    for entity_type in shown_types:
+        verts_buf, faces_buf, vert_counts, face_counts = buffers_by_type.pop(entity_type)
+        print(f"Adding {len(vert_counts)} {entity_type} entities to visualization")
+        combined_mesh = combine_meshes(verts_buf, faces_buf, vert_counts, face_counts)
+        
+        # Color and opacity for the entity type
+        rgba = color_lut[type_to_idx[entity_type]]
         
-        for entity in entities:
-            try:
-                mesh, actual_type = create_entity_mesh(settings, entity, colors)
-                meshes_by_type[actual_type].append(mesh)
-                entity_count += 1
-            except RuntimeError as e:
-                print(f"Error processing {entity_type} entity: {e}")
-    
-    # Add meshes to plotter by type
-    for entity_type, meshes in meshes_by_type.items():
-        if meshes:
-            print(f"Adding {len(meshes)} {entity_type} entities to visualization")
-            combined_mesh = meshes[0]
-            if len(meshes) > 1:
-                for mesh in meshes[1:]:
-                    combined_mesh = combined_mesh.merge(mesh)
-            
-            # Get color from the first mesh
-            color = meshes[0]['color']
-            opacity = meshes[0]['opacity']
-            
-            # Add to plotter
-            plotter.add_mesh(combined_mesh, color=color, opacity=opacity, show_edges=False)
+        # Add to plotter
+        plotter.add_mesh(combined_mesh, color=rgba[:3], opacity=float(rgba[3]), show_edges=False)
     
     print(f"Visualization complete with {entity_count} entities")
     
@@ -153,9 +164,8 @@ def visualize_ifc(ifc_file):
     plotter.add_title("New York Brownstone IFC Model", font_size=16)
     
     # Add a legend
-    labels = [entity_type.replace('Ifc', '') for entity_type in meshes_by_type if meshes_by_type[entity_type]]
-    colors_list = [colors[entity_type] if len(colors[entity_type]) == 3 else colors[entity_type][:3] 
-                  for entity_type in meshes_by_type if meshes_by_type[entity_type]]
+    labels = [entity_type.replace('Ifc', '') for entity_type in shown_types]
+    colors_list = [color_lut[type_to_idx[entity_type], :3] for entity_type in shown_types]
     
     if labels and colors_list:
         plotter.add_legend(labels, colors_list, size=(0.15, 0.15), loc='upper right')